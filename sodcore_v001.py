@@ -1,9 +1,13 @@
 import pandas as pd
 from pathlib import Path
 import logging
-from typing import Dict, List, Set
-from dataclasses import dataclass
+from typing import Dict, List, Set, Tuple, Union
+from dataclasses import dataclass, field, replace
+from collections import Counter
 import warnings
+import sys
+import re
+from concurrent.futures import ProcessPoolExecutor
 
 # Configure logging
 logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
@@ -15,6 +19,27 @@ class Config:
     excel_path: str = r"C:\Users\itski\01py\SoX\Rules2.xlsx"
     output_path: str = r"C:\Users\itski\01py\SoX\Report.xlsx"
     critical_functions: List[str] = None
+    summary_only: bool = False  # Skip the detail sheet, write only summary sheets
+    top_pairs: int = 50  # Number of conflicting tcode pairs kept in the summary
+    business_process_column: str = 'Business process'
+    # Transaction usage export (ST03N/STAD-style CSV of user, tcode, date)
+    usage_log_path: str = None
+    user_roles_path: str = None  # Optional CSV of user, role assignments
+    usage_user_column: str = 'User'
+    usage_tcode_column: str = 'T-code'
+    usage_role_column: str = 'Role'
+    usage_chunksize: int = 1_000_000
+    usage_filter: bool = False  # Drop findings not exercised instead of annotating them
+    remediation: bool = False  # Propose minimal tcode removals per conflicted role
+    remediation_exact_limit: int = 20  # Solve exactly when a role has at most this many conflicting tcodes
+    remediation_workers: int = None  # Worker processes for remediation (None = CPU count)
+    remediation_exercised_only: bool = False  # Only clear conflicts whose both sides were used
+    role_type: str = None  # 'single' or 'composite'; prompted for when not set
+    # Multi-system mode: system/client label -> role extract workbook (roles on sheet 0),
+    # or (extract, usage_log_path, user_roles_path) to apply a usage log per system
+    systems: Dict[str, Union[str, Tuple[str, ...]]] = None
+    system_workers: int = None  # Worker processes for systems (None = CPU count)
+    consolidated_detail: bool = False  # Also copy every system's findings into the consolidated report
     
     def __post_init__(self):
         if self.critical_functions is None:
@@ -26,6 +51,173 @@ class Config:
                 'PS05', 'SD08', 'SD09'
             ]
 
+@dataclass
+class SummaryAggregates:
+    """Running counters over emitted findings, used for the summary sheets."""
+    by_role: Counter = field(default_factory=Counter)
+    by_priority: Counter = field(default_factory=Counter)
+    by_process: Counter = field(default_factory=Counter)
+    by_tcode_pair: Counter = field(default_factory=Counter)
+    total: int = 0
+    per_system: bool = False  # Counter keys are (system, key) after merging systems
+
+    def add(self, result: Dict, process: str) -> None:
+        """Count one unique finding."""
+        self.total += 1
+        self.by_role[result['0Roles']] += 1
+        self.by_priority[result['10Risk Description']] += 1
+        self.by_process[process] += 1
+        if result['6CTcode'] != 'CRITICAL':
+            # (A, B) and (B, A) are the same conflict seen from either side
+            self.by_tcode_pair[tuple(sorted((result['1Tcode'], result['6CTcode']), key=str))] += 1
+
+    def merge(self, other: 'SummaryAggregates', system: str) -> None:
+        """Fold another system's counters into this one, keyed by system."""
+        self.per_system = True
+        self.total += other.total
+        for mine, theirs in (
+            (self.by_role, other.by_role),
+            (self.by_priority, other.by_priority),
+            (self.by_process, other.by_process),
+            (self.by_tcode_pair, other.by_tcode_pair),
+        ):
+            mine.update({(system, key): n for key, n in theirs.items()})
+
+    def to_frames(self, top_pairs: int) -> Dict[str, pd.DataFrame]:
+        """Build one DataFrame per summary sheet."""
+        def counts(counter: Counter, column: str) -> pd.DataFrame:
+            if self.per_system:
+                return pd.DataFrame(
+                    [(system, key, n) for (system, key), n in counter.most_common()],
+                    columns=['System', column, 'Risk count']
+                )
+            return pd.DataFrame(counter.most_common(), columns=[column, 'Risk count'])
+
+        if self.per_system:
+            # Top pairs per system, so smaller systems are not crowded out
+            per_system = {}
+            for (system, (tcode, ctcode)), n in self.by_tcode_pair.most_common():
+                rows = per_system.setdefault(system, [])
+                if len(rows) < top_pairs:
+                    rows.append((system, tcode, ctcode, n))
+            pairs = pd.DataFrame(
+                [row for rows in per_system.values() for row in rows],
+                columns=['System', 'Tcode', 'Conflicting Tcode', 'Risk count']
+            )
+        else:
+            pairs = pd.DataFrame(
+                [(tcode, ctcode, n) for (tcode, ctcode), n in self.by_tcode_pair.most_common(top_pairs)],
+                columns=['Tcode', 'Conflicting Tcode', 'Risk count']
+            )
+        return {
+            'Summary_Roles': counts(self.by_role, 'Role'),
+            'Summary_Priority': counts(self.by_priority, 'Priority'),
+            'Summary_Process': counts(self.by_process, 'Business process'),
+            'Summary_Tcode_Pairs': pairs,
+        }
+
+def _bits(mask: int) -> List[int]:
+    """Return the single-bit masks set in mask."""
+    result = []
+    while mask:
+        low = mask & -mask
+        result.append(low)
+        mask ^= low
+    return result
+
+def _greedy_hitting_set(masks: List[int]) -> int:
+    """Repeatedly remove the tcode that clears the most remaining conflicts."""
+    chosen = 0
+    remaining = masks
+    while remaining:
+        counts = Counter(bit for mask in remaining for bit in _bits(mask))
+        best = max(counts, key=counts.get)
+        chosen |= best
+        remaining = [mask for mask in remaining if not mask & best]
+    return chosen
+
+def _exact_hitting_set(masks: List[int], upper: int) -> int:
+    """Branch and bound over the smallest open conflict, starting from a known solution."""
+    best = [upper, bin(upper).count('1')]
+
+    def search(remaining: List[int], chosen: int, size: int) -> None:
+        if not remaining:
+            best[0], best[1] = chosen, size
+            return
+        if size + 1 >= best[1]:
+            return
+        pivot = min(remaining, key=lambda mask: bin(mask).count('1'))
+        for bit in _bits(pivot):
+            search([mask for mask in remaining if not mask & bit], chosen | bit, size + 1)
+
+    search(masks, 0, 0)
+    return best[0]
+
+def _solve_role_remediation(args: Tuple[str, List[Tuple[str, ...]], int]) -> Dict:
+    """Compute a minimal (or near-minimal) set of tcodes to remove from one role."""
+    role, conflicts, exact_limit = args
+    tcodes = sorted(set().union(*conflicts))
+    index = {tcode: 1 << i for i, tcode in enumerate(tcodes)}
+    masks = set()
+    for conflict in conflicts:
+        mask = 0
+        for tcode in conflict:
+            mask |= index[tcode]
+        masks.add(mask)
+    # (A, B) and (B, A) are emitted separately but encode the same mask
+    conflict_count = len(masks)
+    # A conflict that contains another one is cleared whenever the smaller one is
+    masks = sorted(masks, key=lambda mask: bin(mask).count('1'))
+    minimal = []
+    for mask in masks:
+        if not any(kept & mask == kept for kept in minimal):
+            minimal.append(mask)
+    
+    chosen = _greedy_hitting_set(minimal)
+    method = 'greedy'
+    if len(tcodes) <= exact_limit:
+        chosen = _exact_hitting_set(minimal, chosen)
+        method = 'exact'
+    removals = [tcode for tcode in tcodes if chosen & index[tcode]]
+    return {
+        'Role': role,
+        'Conflicts': conflict_count,
+        'Tcodes to remove': ', '.join(removals),
+        'Removal count': len(removals),
+        'Method': method
+    }
+
+# Rows available for findings on one Excel sheet (1,048,576 minus the header)
+EXCEL_MAX_ROWS = 1_048_575
+
+# Compiled ruleset shared by every system analyzed in a worker process
+_worker_ruleset = None
+
+def _init_system_worker(ruleset: Dict) -> None:
+    """Receive the compiled ruleset once per worker process."""
+    global _worker_ruleset
+    _worker_ruleset = ruleset
+
+def _analyze_system(args: Tuple[str, str, 'Config']) -> Tuple:
+    """Analyze one system's role extract against the shared ruleset and export its report."""
+    system, extract_path, config = args
+    analyzer = SODAnalyzer(config)
+    analyzer.processed_data = _worker_ruleset
+    analyzer.load_roles(extract_path)
+    if config.usage_log_path:
+        analyzer.load_usage()
+    results = analyzer.run_analysis()
+    if config.remediation and analyzer.role_conflicts:
+        analyzer.propose_remediation()
+    report = None
+    if analyzer.summary.total:
+        analyzer.export_results(results)
+        report = config.output_path
+    # Detail rows stay in the system's own report unless a consolidated copy was asked for
+    if not config.consolidated_detail:
+        results = None
+    return system, report, results, analyzer.summary, analyzer.remediation_df
+
 class SODAnalyzer:
     """Segregation of Duties (SOD) Risk Analysis Tool."""
     
@@ -33,8 +225,16 @@ class SODAnalyzer:
         self.config = config
         self.dataframes = {}
         self.processed_data = {}
+        self.summary = SummaryAggregates()
+        self._seen_results = set()
+        self.tcode_users = None
+        self.role_users = None
+        self._usage_cache = {}
+        self.role_conflicts = {}
+        self.remediation_df = None
+        self.system_index = None
         
-    def load_data(self) -> None:
+    def load_data(self, include_roles: bool = True) -> None:
         """Load all required Excel sheets into memory."""
         try:
             excel_path = Path(self.config.excel_path)
@@ -50,6 +250,9 @@ class SODAnalyzer:
                 'risk_library': ('Risk Library', None)
             }
             
+            if not include_roles:
+                del sheet_mapping['main']
+            
             for key, (sheet, index_col) in sheet_mapping.items():
                 self.dataframes[key] = pd.read_excel(
                     excel_path, 
@@ -62,17 +265,105 @@ class SODAnalyzer:
             logger.error(f"Error loading data: {e}")
             raise
     
+    def load_roles(self, extract_path: str) -> None:
+        """Load a role extract (roles on sheet 0) to analyze against the loaded ruleset."""
+        try:
+            extract_path = Path(extract_path)
+            if not extract_path.exists():
+                raise FileNotFoundError(f"Role extract not found: {extract_path}")
+            self.dataframes['main'] = pd.read_excel(extract_path, sheet_name=0)
+            logger.info(f"Loaded main sheet from {extract_path} with {len(self.dataframes['main'])} rows")
+        except Exception as e:
+            logger.error(f"Error loading role extract: {e}")
+            raise
+    
+    def load_usage(self) -> None:
+        """Stream the usage export in chunks into a tcode -> users index."""
+        try:
+            if self.config.usage_filter and not self.config.user_roles_path:
+                raise ValueError("usage_filter requires user_roles_path to map users to roles")
+            usage_path = Path(self.config.usage_log_path)
+            if not usage_path.exists():
+                raise FileNotFoundError(f"Usage log not found: {usage_path}")
+            
+            user_col = self.config.usage_user_column
+            tcode_col = self.config.usage_tcode_column
+            rows = 0
+            tcode_users = {}
+            reader = pd.read_csv(
+                usage_path,
+                usecols=[user_col, tcode_col],
+                dtype=str,
+                chunksize=self.config.usage_chunksize
+            )
+            for chunk in reader:
+                rows += len(chunk)
+                # Collapse the chunk to distinct (user, tcode) pairs before touching the sets
+                pairs = chunk.dropna().drop_duplicates()
+                for tcode, users in pairs.groupby(tcode_col)[user_col]:
+                    executed = tcode_users.setdefault(sys.intern(tcode), set())
+                    executed.update(sys.intern(u) for u in users)
+            self.tcode_users = {tcode: frozenset(users) for tcode, users in tcode_users.items()}
+            logger.info(f"Streamed {rows} usage rows for {len(self.tcode_users)} tcodes")
+            
+            if self.config.user_roles_path:
+                role_col = self.config.usage_role_column
+                assignments = pd.read_csv(
+                    self.config.user_roles_path,
+                    usecols=[user_col, role_col],
+                    dtype=str
+                ).dropna()
+                self.role_users = {
+                    role: frozenset(sys.intern(u) for u in users)
+                    for role, users in assignments.groupby(role_col)[user_col]
+                }
+            else:
+                # No assignments: every user in the log is checked against every role
+                logger.warning(
+                    "No user_roles_path given; usage is checked against all users, "
+                    "not the users assigned to each role"
+                )
+            
+        except Exception as e:
+            logger.error(f"Error loading usage log: {e}")
+            raise
+    
+    def _annotate_usage(self, result: Dict) -> bool:
+        """Add usage columns to a finding; return False if it should be filtered out."""
+        if self.tcode_users is None:
+            return True
+        tcode = result['1Tcode']
+        ctcode = tcode if result['6CTcode'] == 'CRITICAL' else result['6CTcode']
+        key = (tcode, ctcode)
+        if key not in self._usage_cache:
+            tcode_users = self.tcode_users.get(tcode, frozenset())
+            ctcode_users = self.tcode_users.get(ctcode, frozenset())
+            if self.role_users is not None:
+                assigned = self.role_users.get(result['0Roles'], frozenset())
+                tcode_users = tcode_users & assigned
+                ctcode_users = ctcode_users & assigned
+            # A conflict is only exercised when one user ran both sides
+            both_users = len(tcode_users & ctcode_users)
+            self._usage_cache[key] = (bool(tcode_users), bool(ctcode_users), both_users)
+        tcode_used, ctcode_used, both_users = self._usage_cache[key]
+        result['11Tcode used'] = tcode_used
+        result['12CTcode used'] = ctcode_used
+        result['13Both used'] = both_users > 0
+        result['14Users with both'] = both_users
+        return result['13Both used'] or not self.config.usage_filter
+    
     def preprocess_data(self) -> None:
         """Preprocess data for efficient lookups."""
         # Create efficient lookup dictionaries
-        df_main = self.dataframes['main']
-        
-        # Group roles and their T-codes
-        self.processed_data['role_tcodes'] = (
-            df_main.groupby('Single roles')['T-code']
-            .apply(set)
-            .to_dict()
-        )
+        if 'main' in self.dataframes:
+            df_main = self.dataframes['main']
+            
+            # Group roles and their T-codes
+            self.processed_data['role_tcodes'] = (
+                df_main.groupby('Single roles')['T-code']
+                .apply(set)
+                .to_dict()
+            )
         
         # Create function-action mappings
         df_action_func = self.dataframes['action_function']
@@ -214,11 +505,45 @@ class SODAnalyzer:
         
         return results
     
+    def _emit_result(self, result: Dict, all_results: List[Dict], risk_details: Dict) -> None:
+        """Record a finding once and update the summary counters."""
+        # Normalize blanks like the detail sheet's fillna so counters and rows agree
+        for column, value in result.items():
+            if pd.isna(value):
+                result[column] = 'CRITICAL'
+        key = tuple(result.values())
+        if key in self._seen_results:
+            return
+        self._seen_results.add(key)
+        keep = self._annotate_usage(result)
+        if self.config.remediation and (
+            not self.config.remediation_exercised_only or result.get('13Both used', True)
+        ):
+            # Collected before the usage filter so proposals clear all of the role's risks;
+            # critical findings need the tcode itself removed
+            ctcode = result['6CTcode']
+            conflict = (result['1Tcode'],) if ctcode == 'CRITICAL' else (result['1Tcode'], ctcode)
+            self.role_conflicts.setdefault(result['0Roles'], set()).add(conflict)
+        if not keep:
+            return
+        # Fall back to the function prefix (FI, MM, HR, ...) when the
+        # risk library has no business process column
+        process = risk_details.get(self.config.business_process_column)
+        if pd.isna(process) or not process:
+            process = str(result['4Func'])[:2]
+        self.summary.add(result, process)
+        if not self.config.summary_only:
+            all_results.append(result)
+
     def run_analysis(self) -> pd.DataFrame:
         logger.info("Starting SOD analysis...")
+        self.summary = SummaryAggregates()
+        self._seen_results = set()
+        self.role_conflicts = {}
 
         # Prompt user for role type
-        roles_type = input("Enter Type of role Single or Composite \n").strip().lower()
+        roles_type = self.config.role_type or input("Enter Type of role Single or Composite \n")
+        roles_type = roles_type.strip().lower()
         df_main = self.dataframes['main']
 
         if roles_type == 'single':
@@ -236,6 +561,11 @@ class SODAnalyzer:
         all_results = []
 
         for x in roles:
+            # Findings are emitted role by role, so duplicates only need tracking per role
+            self._seen_results.clear()
+            if self.role_users is not None:
+                # Usage results depend on the role's users only when assignments are loaded
+                self._usage_cache.clear()
             # Get T-codes for this role
             try:
                 lTxns = df_main[df_main[role_col] == x]['T-code'].dropna().tolist()
@@ -270,7 +600,7 @@ class SODAnalyzer:
                                             '9Risk Description': risk_details.get('Risk type', ''),
                                             '10Risk Description': risk_details.get('Priority', '')
                                         }
-                                        all_results.append(result)
+                                        self._emit_result(result, all_results, risk_details)
                                         print(x, i, "-", risk, function, "(CRIT)")
                                 break  # like soxs.py
                             else:
@@ -298,7 +628,7 @@ class SODAnalyzer:
                                                                 '9Risk Description': risk_details.get('Risk type', ''),
                                                                 '10Risk Description': risk_details.get('Priority', '')
                                                             }
-                                                            all_results.append(result)
+                                                            self._emit_result(result, all_results, risk_details)
                                                             print(x, i, "-", risk, function, criskFunc['RFunctions'], j)
                                             else:
                                                 continue
@@ -309,8 +639,111 @@ class SODAnalyzer:
         results_df = pd.DataFrame(all_results)
         if not results_df.empty:
             results_df = results_df.fillna("CRITICAL")
-            results_df = results_df.drop_duplicates()  # Remove duplicate rows
-        logger.info(f"Analysis completed. Found {len(results_df)} risk instances")
+        logger.info(f"Analysis completed. Found {self.summary.total} risk instances")
+        return results_df
+    
+    def propose_remediation(self) -> pd.DataFrame:
+        """Solve the per-role hitting-set problem over the collected conflicts."""
+        logger.info(f"Computing remediation for {len(self.role_conflicts)} roles...")
+        tasks = [
+            (role, list(conflicts), self.config.remediation_exact_limit)
+            for role, conflicts in self.role_conflicts.items()
+        ]
+        if self.config.remediation_workers == 1:
+            proposals = list(map(_solve_role_remediation, tasks))
+        else:
+            with ProcessPoolExecutor(max_workers=self.config.remediation_workers) as executor:
+                proposals = list(executor.map(_solve_role_remediation, tasks, chunksize=64))
+        
+        self.remediation_df = pd.DataFrame(
+            proposals,
+            columns=['Role', 'Conflicts', 'Tcodes to remove', 'Removal count', 'Method']
+        )
+        exercised_only = self.config.remediation_exercised_only and self.tcode_users is not None
+        self.remediation_df['Scope'] = 'Exercised conflicts' if exercised_only else 'All conflicts'
+        logger.info("Remediation proposals completed")
+        return self.remediation_df
+    
+    def run_multi_system(self) -> pd.DataFrame:
+        """Analyze every configured system concurrently against the loaded ruleset.
+        
+        Each worker writes its own '<output>_<system>.xlsx' report with the
+        detail rows; only summaries and remediation come back to be kept on
+        this analyzer for the consolidated report. The returned findings are
+        empty unless Config.consolidated_detail is set.
+        """
+        logger.info(f"Starting multi-system SOD analysis for {len(self.config.systems)} systems...")
+        if self.config.usage_log_path or self.config.user_roles_path:
+            # User IDs differ between systems, so one log cannot be applied to all of them
+            raise ValueError(
+                "usage_log_path/user_roles_path cannot be combined with systems; "
+                "give each system (extract, usage_log_path, user_roles_path) instead"
+            )
+        if not self.config.role_type:
+            self.config.role_type = input("Enter Type of role Single or Composite \n")
+        
+        output_path = Path(self.config.output_path)
+        tasks = []
+        file_labels = {}
+        for system, source in self.config.systems.items():
+            if isinstance(source, str):
+                extract_path, usage_log_path, user_roles_path = source, None, None
+            else:
+                extract_path, usage_log_path, user_roles_path = (tuple(source) + (None, None))[:3]
+            if self.config.usage_filter and not usage_log_path:
+                raise ValueError(f"usage_filter is set but system {system!r} has no usage log")
+            
+            # Labels such as 'ECC/100' or 'S4:200' are not valid in Windows file names
+            file_label = re.sub(r'[^\w.-]+', '_', str(system)).strip('._') or 'system'
+            if file_label in file_labels:
+                raise ValueError(
+                    f"Systems {file_labels[file_label]!r} and {system!r} map to the same report name"
+                )
+            file_labels[file_label] = system
+            system_output = output_path.with_name(f"{output_path.stem}_{file_label}{output_path.suffix}")
+            # Parallelism is across systems, so each system solves remediation in-process
+            system_config = replace(
+                self.config,
+                output_path=str(system_output),
+                systems=None,
+                usage_log_path=usage_log_path,
+                user_roles_path=user_roles_path,
+                remediation_workers=1
+            )
+            tasks.append((system, extract_path, system_config))
+        
+        self.summary = SummaryAggregates()
+        all_results = []
+        remediation = []
+        index = []
+        with ProcessPoolExecutor(
+            max_workers=self.config.system_workers,
+            initializer=_init_system_worker,
+            initargs=(self.processed_data,)
+        ) as executor:
+            for system, report, results, summary, remediation_df in executor.map(_analyze_system, tasks):
+                logger.info(f"{system}: found {summary.total} risk instances")
+                self.summary.merge(summary, system)
+                index.append((system, summary.total, report or ''))
+                if results is not None and not results.empty:
+                    results.insert(0, 'System', system)
+                    all_results.append(results)
+                if remediation_df is not None:
+                    remediation_df.insert(0, 'System', system)
+                    remediation.append(remediation_df)
+        
+        self.system_index = pd.DataFrame(index, columns=['System', 'Risk count', 'Report'])
+        if remediation:
+            self.remediation_df = pd.concat(remediation, ignore_index=True)
+        detail_rows = sum(len(results) for results in all_results)
+        if detail_rows > EXCEL_MAX_ROWS:
+            logger.warning(
+                f"Consolidated detail has {detail_rows} rows, more than one Excel sheet holds; "
+                "see the per-system reports for findings"
+            )
+            all_results = []
+        results_df = pd.concat(all_results, ignore_index=True) if all_results else pd.DataFrame()
+        logger.info(f"Multi-system analysis completed. Found {self.summary.total} risk instances")
         return results_df
     
     def export_results(self, results_df: pd.DataFrame) -> None:
@@ -319,14 +752,25 @@ class SODAnalyzer:
             output_path = Path(self.config.output_path)
             output_path.parent.mkdir(parents=True, exist_ok=True)
             
+            sheets = {}
+            if self.system_index is not None:
+                sheets['Systems'] = self.system_index
+            # The consolidated multi-system report only carries detail rows when they were kept
+            if not self.config.summary_only and (self.system_index is None or not results_df.empty):
+                sheets['SOD_Analysis'] = results_df
+            sheets.update(self.summary.to_frames(self.config.top_pairs))
+            if self.remediation_df is not None:
+                sheets['Remediation'] = self.remediation_df
+            
             with pd.ExcelWriter(output_path, engine='openpyxl') as writer:
-                results_df.to_excel(writer, sheet_name='SOD_Analysis', index=False)
-                
-                # Add some formatting
-                worksheet = writer.sheets['SOD_Analysis']
-                for column in worksheet.columns:
-                    max_length = max(len(str(cell.value or '')) for cell in column)
-                    worksheet.column_dimensions[column[0].column_letter].width = min(max_length + 2, 50)
+                for sheet_name, df in sheets.items():
+                    df.to_excel(writer, sheet_name=sheet_name, index=False)
+                    
+                    # Add some formatting
+                    worksheet = writer.sheets[sheet_name]
+                    for column in worksheet.columns:
+                        max_length = max(len(str(cell.value or '')) for cell in column)
+                        worksheet.column_dimensions[column[0].column_letter].width = min(max_length + 2, 50)
             
             logger.info(f"Results exported to: {output_path}")
             
@@ -350,16 +794,23 @@ def main():
         analyzer = SODAnalyzer(config)
         
         # Load and preprocess data
-        analyzer.load_data()
+        analyzer.load_data(include_roles=not config.systems)
         analyzer.preprocess_data()
+        if config.usage_log_path and not config.systems:
+            analyzer.load_usage()
         
         # Run analysis
-        results = analyzer.run_analysis()
+        if config.systems:
+            results = analyzer.run_multi_system()
+        else:
+            results = analyzer.run_analysis()
+            if config.remediation and analyzer.role_conflicts:
+                analyzer.propose_remediation()
         
         # Export results
-        if not results.empty:
+        if analyzer.summary.total:
             analyzer.export_results(results)
-            print(f"Analysis complete! Found {len(results)} risk instances.")
+            print(f"Analysis complete! Found {analyzer.summary.total} risk instances.")
         else:
             print("No risks found in the analysis.")
             